@@ -25,7 +25,7 @@ import pprint
 import sys
 from datetime import datetime, timedelta
 
-from . import Client, RequestFailedError, get_credentials, get_session
+from . import Client, RequestFailedError, get_credentials
 
 
 def build_arg_parser():
@@ -85,21 +85,16 @@ async def _main():
         print("Missing username or password", file=sys.stderr)
         sys.exit(1)
 
-    session = await get_session()
-    client = Client(
-        username=username, password=password, session=session, logger=logger
-    )
-
-    try:
-        if data := await get_requested_data():
-            print(pprint.pformat(data))
-
-    except RequestFailedError as e:
-        print(f"Request failed: {e}", file=sys.stderr)
-        await session.close()
-        sys.exit(1)
+    async with await Client.create(
+        username=username, password=password, logger=logger
+    ) as client:
+        try:
+            if data := await get_requested_data():
+                print(pprint.pformat(data))
 
-    await session.close()
+        except RequestFailedError as e:
+            print(f"Request failed: {e}", file=sys.stderr)
+            sys.exit(1)
 
 
 def main():
@@ -19,11 +19,22 @@
 import functools
 import json
 import logging
-from datetime import datetime, timedelta
+import time
+from datetime import date, datetime, timedelta
 from typing import Any
 
 import aiohttp
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None  # type: ignore[assignment]
+
 from . import parsers
 from .types import (
     HistoricalConsumption,
@@ -40,35 +51,91 @@ _BASE_URL = "https://www.i-de.es/consumidores/rest"
 _CONTRACTS_ENDPOINT = f"{_BASE_URL}/cto/listaCtos/"
 _CONTRACT_DETAILS_ENDPOINT = f"{_BASE_URL}/detalleCto/detalle/"
 _CONTRACT_SELECTION_ENDPOINT = f"{_BASE_URL}/cto/seleccion/"
-_GENERATION_PERIOD_ENDPOINT = (
-    f"{_BASE_URL}/consumoNew/obtenerDatosGeneracionPeriodo/"
-    "fechaInicio/{start:%d-%m-%Y}00:00:00/"
-    "fechaFinal/{end:%d-%m-%Y}00:00:00/"
-)
 _ICP_STATUS_ENDPOINT = f"{_BASE_URL}/rearmeICP/consultarEstado"
 _LOGIN_ENDPOINT = f"{_BASE_URL}/loginNew/login"
 _MEASURE_ENDPOINT = f"{_BASE_URL}/escenarioNew/obtenerMedicionOnline/24"
 
+
+@functools.lru_cache(maxsize=64)
+def _format_date(d: date) -> str:
+    # Pollers request the same few days over and over, strftime is not cheap
+    return d.strftime("%d-%m-%Y")
+
+
+def _build_generation_period_url(start: datetime, end: datetime) -> str:
+    return (
+        f"{_BASE_URL}/consumoNew/obtenerDatosGeneracionPeriodo/"
+        f"fechaInicio/{_format_date(start.date())}00:00:00/"
+        f"fechaFinal/{_format_date(end.date())}00:00:00/"
+    )
+
+
 #
 # URLs reviewed on 2023-06-22
 #
-_CONSUMPTION_PERIOD_ENDPOINT = (
-    f"{_BASE_URL}/consumoNew/obtenerDatosConsumoDH/"
-    "{start:%d-%m-%Y}/"
-    "{end:%d-%m-%Y}/"
-    "horas/USU/"
-)
+def _build_consumption_period_url(start: datetime, end: datetime) -> str:
+    return (
+        f"{_BASE_URL}/consumoNew/obtenerDatosConsumoDH/"
+        f"{_format_date(start.date())}/"
+        f"{_format_date(end.date())}/"
+        "horas/USU/"
+    )
+
 
 _POWER_DEMAND_LIMITS_ENDPOINT = f"{_BASE_URL}/consumoNew/obtenerLimitesFechasPotencia/"
-_POWER_DEMAND_PERIOD_ENDPOINT = (
-    f"{_BASE_URL}/consumoNew/obtenerPotenciasMaximasRangoV2/"
+
+
+def _build_power_demand_period_url(limits: dict[str, Any]) -> str:
     # fecMin and fecMax are provided by _POWER_DEMAND_LIMITS_ENDPOINT
-    "{fecMin}/{fecMax}"
-)
+    return (
+        f"{_BASE_URL}/consumoNew/obtenerPotenciasMaximasRangoV2/"
+        f"{limits['fecMin']}/{limits['fecMax']}"
+    )
+
+
+# simdjson parsers are expensive to build, reuse a single one.
+_SIMDJSON_PARSER = simdjson.Parser() if simdjson else None
+
+
+def _json_loads_lazy(buff: bytes, encoding: str = "utf-8") -> Any:
+    """
+    Parse JSON without materializing the full document if simdjson is
+    available. Returned objects are read-only dict/list-alikes.
+    Malformed payloads raise InvalidData whatever the backend is.
+    """
+    try:
+        if simdjson is None or _SIMDJSON_PARSER is None:
+            return json.loads(buff.decode(encoding))
+
+        # simdjson wants UTF-8. ASCII payloads (the usual case) are valid as-is,
+        # avoid decoding and re-encoding them.
+        doc: bytes | str = buff if buff.isascii() else buff.decode(encoding)
+        try:
+            return _SIMDJSON_PARSER.parse(doc)
+        except RuntimeError:
+            # Shared parser is still referenced by a previous document. Parse
+            # this one on its own parser and keep the shared one for later
+            # calls, any other error is raised again from there.
+            return simdjson.Parser().parse(doc)
+
+    except ValueError as e:
+        raise InvalidData(buff) from e
+
+
+def _json_dumps(obj: Any) -> str:
+    if orjson is None:
+        return json.dumps(obj)
+
+    return orjson.dumps(obj).decode("utf-8")
 
 
 async def get_session() -> aiohttp.ClientSession:
-    return aiohttp.ClientSession()
+    # Keep a small pool of long-lived connections, all requests go to the same
+    # host so TLS handshakes and DNS lookups can be amortized between polls.
+    connector = aiohttp.TCPConnector(limit=4, keepalive_timeout=75, ttl_dns_cache=300)
+    return aiohttp.ClientSession(
+        connector=connector, headers=Client._HEADERS, json_serialize=_json_dumps
+    )
 
 
 def auth_required(fn):
@@ -116,7 +183,51 @@ class Client:
         self._user_session_timeout = user_session_timeout
         self._auto_renew_user_session = auto_renew_user_session
 
-        self._login_ts: datetime | None = None
+        self._login_payload = [
+            username,
+            password,
+            "",
+            "Android 6.0",
+            "Móvil",
+            "Chrome 119.0.0.0",
+            "0",
+            "",
+            "s",
+            "",
+        ]
+
+        # Sessions from get_session() already carry _HEADERS as defaults
+        self._session_has_headers = session is not None and all(
+            session.headers.get(k) == v for k, v in self._HEADERS.items()
+        )
+        self._owns_session = False
+        self._login_deadline: float = 0.0
+
+    @classmethod
+    async def create(cls, username: str, password: str, **kwargs) -> "Client":
+        """
+        Build a client owning its own pooled session.
+        Use it as an async context manager or call close() when done.
+        """
+        session = await get_session()
+        try:
+            client = cls(session, username, password, **kwargs)
+        except BaseException:
+            await session.close()
+            raise
+
+        client._owns_session = True
+        return client
+
+    async def close(self) -> None:
+        if self._owns_session:
+            await self._sess.close()
+
+    async def __aenter__(self) -> "Client":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
 
     #
     # Some properties
@@ -132,11 +243,7 @@ class Client:
 
     @property
     def is_logged(self) -> bool:
-        if not self._login_ts:
-            return False
-
-        delta = datetime.now() - self._login_ts
-        return delta < self.user_session_timeout
+        return time.monotonic() < self._login_deadline
 
     @property
     def user_session_timeout(self) -> timedelta:
@@ -151,12 +258,16 @@ class Client:
     #
 
     async def _request(self, method: str, url: str, **kwargs) -> aiohttp.ClientResponse:
-        headers = kwargs.get("headers", {})
-        headers.update(self._HEADERS)
-        kwargs["headers"] = headers
+        # Sessions carrying _HEADERS as defaults get them merged by aiohttp
+        # with per-request headers. Caller provided headers take precedence
+        # and are never mutated.
+        if not self._session_has_headers:
+            kwargs["headers"] = self._HEADERS | kwargs.get("headers", {})
 
         resp = await self._sess.request(method, url, **kwargs)
         if resp.status != 200:
+            # Body is never read on errors, give the connection back to the pool
+            resp.release()
             raise RequestFailedError(resp)
 
         return resp
@@ -170,7 +281,12 @@ class Client:
         self, method: str, url: str, encoding: str = "utf-8", **kwargs
     ) -> dict[Any, Any]:
         buff = await self.request_bytes(method, url, **kwargs)
-        data = json.loads(buff.decode(encoding))
+        if orjson is not None and encoding == "utf-8":
+            # orjson parses UTF-8 bytes directly, no intermediate str
+            data = orjson.loads(buff)
+        else:
+            data = json.loads(buff.decode(encoding))
+
         return data
 
     #
@@ -187,27 +303,18 @@ class Client:
             'uCcr': ''
         }
         """
-        payload = [
-            self.username,
-            self.password,
-            "",
-            "Android 6.0",
-            "Móvil",
-            "Chrome 119.0.0.0",
-            "0",
-            "",
-            "s",
-            "",
-        ]
-
-        data = await self.request_json("POST", _LOGIN_ENDPOINT, json=payload)
+        data = await self.request_json(
+            "POST", _LOGIN_ENDPOINT, json=self._login_payload
+        )
         if not isinstance(data, dict):
             raise InvalidData(data)
 
         if data.get("success", "false") != "true":
             raise CommandError(data)
 
-        self._login_ts = datetime.now()
+        self._login_deadline = (
+            time.monotonic() + self._user_session_timeout.total_seconds()
+        )
         self._logger.info(f"successful authentication as '{self.username}'")
 
         if self._contract:
@@ -221,7 +328,13 @@ class Client:
             'icp': 'trueConectado'
         }
         """
-        data = await self.request_json("POST", _ICP_STATUS_ENDPOINT)
+        buff = await self.request_bytes("POST", _ICP_STATUS_ENDPOINT)
+
+        # Fast path for the usual compact reply, fallback to a full parse
+        if b'"icp":"trueConectado"' in buff:
+            return True
+
+        data = json.loads(buff.decode("utf-8"))
         ret = data.get("icp", "") == "trueConectado"
 
         return ret
@@ -369,9 +482,9 @@ class Client:
     async def get_historical_consumption(
         self, start: datetime, end: datetime
     ) -> HistoricalConsumption:
-        start = min([start, end])
-        end = max([start, end])
-        url = _CONSUMPTION_PERIOD_ENDPOINT.format(start=start, end=end)
+        if start > end:
+            start, end = end, start
+        url = _build_consumption_period_url(start, end)
 
         data = await self.request_json("GET", url, encoding="iso-8859-1")
 
@@ -382,11 +495,12 @@ class Client:
     async def get_historical_generation(
         self, start: datetime, end: datetime
     ) -> HistoricalGeneration:
-        start = min([start, end])
-        end = max([start, end])
-        url = _GENERATION_PERIOD_ENDPOINT.format(start=start, end=end)
+        if start > end:
+            start, end = end, start
+        url = _build_generation_period_url(start, end)
 
-        data = await self.request_json("GET", url, encoding="iso-8859-1")
+        buff = await self.request_bytes("GET", url)
+        data = _json_loads_lazy(buff, encoding="iso-8859-1")
         ret = parsers.parse_historical_generation(data)
 
         return ret
@@ -406,19 +520,17 @@ class Client:
 
     #     return ret
 
-    @auth_required
-    async def get_historical_power_demand(self) -> HistoricalPowerDemand:
-        @auth_required
-        async def _get_available_interval(client):
-            url = _POWER_DEMAND_LIMITS_ENDPOINT
-
-            data = await client.request_json("GET", url)
-            assert data.get("resultado") == "correcto"
+    async def _get_power_demand_limits(self) -> dict[str, Any]:
+        data = await self.request_json("GET", _POWER_DEMAND_LIMITS_ENDPOINT)
+        if data.get("resultado") != "correcto":
+            raise CommandError(data)
 
-            return data
+        return data
 
-        limits = await _get_available_interval(self)
-        url = _POWER_DEMAND_PERIOD_ENDPOINT.format(**limits)
+    @auth_required
+    async def get_historical_power_demand(self) -> HistoricalPowerDemand:
+        limits = await self._get_power_demand_limits()
+        url = _build_power_demand_period_url(limits)
 
         data = await self.request_json("GET", url)
 
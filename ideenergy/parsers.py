@@ -16,8 +16,9 @@
 # USA.
 
 
-import itertools
+from collections.abc import Iterator
 from datetime import datetime, timedelta
+from operator import attrgetter
 from typing import Any
 
 from .types import (
@@ -29,56 +30,89 @@ from .types import (
     PeriodValue,
 )
 
+_HOUR = timedelta(hours=1)
+
+
+def _parse_dmy_hm(s: str) -> datetime:
+    # Fixed width "dd/mm/YYYY HH:MM", slicing is much cheaper than strptime.
+    # Anything else goes through strptime for proper validation.
+    if len(s) == 16 and s[2] == s[5] == "/" and s[10] == " " and s[13] == ":":
+        # int() tolerates signs and whitespace, require plain ASCII digits
+        digits = s[0:2] + s[3:5] + s[6:10] + s[11:13] + s[14:16]
+        if digits.isascii() and digits.isdigit():
+            try:
+                return datetime(
+                    int(s[6:10]),
+                    int(s[3:5]),
+                    int(s[0:2]),
+                    int(s[11:13]),
+                    int(s[14:16]),
+                )
+            except ValueError:
+                pass
+
+    return datetime.strptime(s, "%d/%m/%Y %H:%M")
+
+
+def _normalize_demand_item(item: dict) -> DemandAtInstant:
+    return DemandAtInstant(
+        dt=_parse_dmy_hm(item["name"]),
+        value=item["y"],
+    )
 
-def parser_generic_historical_data(data, base_dt: datetime) -> dict[str, Any]:
-    def _normalize(idx: int, item: dict | None) -> PeriodValue | None:
+
+def parser_generic_historical_data_iter(
+    data, base_dt: datetime
+) -> Iterator[PeriodValue]:
+    # Single pass: skip missing items, convert and build periods on demand
+    for idx, item in enumerate(data["y"]["data"][0]):
         if item is None:
-            return None
+            continue
 
-        start = base_dt + timedelta(hours=idx)
         try:
-            return PeriodValue(
-                start=start, end=start + timedelta(hours=1), value=float(item["valor"])
-            )
+            value = float(item["valor"])
         except (KeyError, ValueError, TypeError):
-            return None
+            continue
+
+        start = base_dt + idx * _HOUR
+        yield PeriodValue(start=start, end=start + _HOUR, value=value)
 
-    g = (_normalize(idx, item) for (idx, item) in enumerate(data["y"]["data"][0]))
-    historical_values = [x for x in g if x is not None]
 
+def parser_generic_historical_data(data, base_dt: datetime) -> dict[str, Any]:
     return {
         # "accumulated": float(data["acumulado"]),
         # "accumulated-co2": float(data["acumuladoCO2"]),
-        "historical": historical_values,
+        "historical": list(parser_generic_historical_data_iter(data, base_dt)),
     }
 
 
 def parse_historical_consumption(data) -> HistoricalConsumption:
-    def list_to_dict(values, keys):
-        return {keys[idx]: values[idx] for idx in range(len(values))}
-
     start = datetime.strptime(data[0]["fechaDesde"], "%d-%m-%Y").replace(
         hour=0, minute=0, second=0
     )
 
-    period_names = data[0]["periodos"]
+    period_names = tuple(data[0]["periodos"])
 
     ret = HistoricalConsumption(
         total=data[0]["total"],
-        desglosed=list_to_dict(data[0]["totalesPeriodosTarifarios"], period_names),
+        desglosed=dict(zip(period_names, data[0]["totalesPeriodosTarifarios"])),
     )
 
-    for idx, value in enumerate(data[0]["valores"]):
+    # Each period ends where the next one starts, one addition per row
+    period_start = start
+
+    rows = data[0]["valoresPeriodosTarifarios"]
+    for value, row in zip(data[0]["valores"], rows):
+        period_end = period_start + _HOUR
         ret.periods.append(
             ConsumptionForPeriod(
-                start=start + timedelta(hours=idx),
-                end=start + timedelta(hours=idx + 1),
+                start=period_start,
+                end=period_end,
                 value=value,
-                desglosed=list_to_dict(
-                    data[0]["valoresPeriodosTarifarios"][idx], period_names
-                ),
+                desglosed=dict(zip(period_names, row)),
             )
         )
+        period_start = period_end
 
     return ret
 
@@ -94,16 +128,8 @@ def parse_historical_generation(data) -> HistoricalGeneration:
 
 
 def parse_historical_power_demand_data(data) -> HistoricalPowerDemand:
-    def _normalize_item(item: dict) -> DemandAtInstant:
-        return DemandAtInstant(
-            dt=datetime.strptime(item["name"], "%d/%m/%Y %H:%M"),
-            value=item["y"],
-        )
-
-    potMaxMens = data["potMaxMens"]
-    potMaxMens = list(itertools.chain.from_iterable([x for x in potMaxMens]))
-
-    demands = [_normalize_item(x) for x in potMaxMens]
-    demands = list(sorted(demands, key=lambda x: x.dt))
+    demands = [_normalize_demand_item(x) for xs in data["potMaxMens"] for x in xs]
+    # Monthly maximums come mostly in order, in-place timsort takes advantage
+    demands.sort(key=attrgetter("dt"))
 
     return HistoricalPowerDemand(demands=demands)
@@ -3,42 +3,50 @@ from datetime import datetime
 from typing import Dict, List
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Measure:
     accumulate: int
     instant: float
 
+    def __iter__(self):
+        # Allow cheap unpacking: accumulate, instant = measure
+        return iter((self.accumulate, self.instant))
 
-@dataclass
+    def asdict(self) -> dict[str, int | float]:
+        # Flat two-field shape, dataclasses.asdict recursion is not needed
+        return {"accumulate": self.accumulate, "instant": self.instant}
+
+
+@dataclass(slots=True)
 class PeriodValue:
     start: datetime
     end: datetime
     value: float
 
 
-@dataclass
+@dataclass(slots=True)
 class ConsumptionForPeriod(PeriodValue):
     desglosed: dict[str, float] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class HistoricalConsumption:
     periods: list[ConsumptionForPeriod] = field(default_factory=list)
     total: float = 0
     desglosed: dict[str, float] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class HistoricalGeneration:
     periods: list[PeriodValue] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class DemandAtInstant:
     dt: datetime
     value: float
 
 
-@dataclass
+@dataclass(slots=True)
 class HistoricalPowerDemand:
     demands: list[DemandAtInstant] = field(default_factory=list)
@@ -18,72 +18,132 @@
 # USA.
 
 
+import argparse
 import asyncio
 import json
+import time
 from datetime import datetime, timedelta
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 from ideenergy import client, get_credentials, get_session
 
+FIXTURES_DIR = Path("tests/fixtures")
+FIXTURES_MAX_AGE = 24 * 60 * 60
+
+
+def is_fresh_fixture(name: str) -> bool:
+    try:
+        st = (FIXTURES_DIR / f"{name}.bin").stat()
+    except FileNotFoundError:
+        return False
+
+    # Empty files are leftovers from failed dumps
+    return st.st_size > 0 and time.time() - st.st_mtime < FIXTURES_MAX_AGE
+
 
 async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--force", action="store_true", help="Download fixtures even if fresh"
+    )
+    args = parser.parse_args()
+
     u, p = get_credentials(credentials="credentials.json")
     sess = await get_session()
     api = client.Client(username=u, password=p, session=sess)
-    await api.login()
 
     end = datetime.now().replace(hour=0, minute=0, second=0)
     start = end - timedelta(days=7)
 
+    async def _write_fixture(name: str, buff: bytes):
+        # Keep disk writes off the event loop, other dumpers may be waiting
+        path = FIXTURES_DIR / f"{name}.bin"
+        await asyncio.to_thread(path.write_bytes, buff)
+
     # Dump measure
     async def _dump_measure():
-        with open("tests/fixtures/measure.bin", mode="wb") as fh:
-            url = client._MEASURE_ENDPOINT
-            fh.write(await api.request_bytes("GET", url))
+        buff = await api.request_bytes("GET", client._MEASURE_ENDPOINT)
+        await _write_fixture("measure", buff)
 
     # Dump historical consumption
     async def _dump_historical_consumption():
-        url = client._CONSUMPTION_PERIOD_ENDPOINT.format(start=start, end=end)
+        url = client._build_consumption_period_url(start, end)
         buff = await api.request_bytes("GET", url)
-        with open("tests/fixtures/historical-consumption.bin", mode="wb") as fh:
-            fh.write(buff)
+        await _write_fixture("historical-consumption", buff)
 
     # Dump historical generation
     async def _dump_historical_generation():
-        url = client._GENERATION_PERIOD_ENDPOINT.format(start=start, end=end)
+        url = client._build_generation_period_url(start, end)
         buff = await api.request_bytes("GET", url)
-        with open("tests/fixtures/historical-generation.bin", mode="wb") as fh:
-            fh.write(buff)
+        await _write_fixture("historical-generation", buff)
 
     # Dump power demand
     async def _dump_historical_power_demand():
         buff = await api.request_bytes("GET", client._POWER_DEMAND_LIMITS_ENDPOINT)
-        with open("tests/fixtures/historical-power-demand-limits.bin", mode="wb") as fh:
-            fh.write(buff)
+        data = orjson.loads(buff) if orjson else json.loads(buff)
+        url = client._build_power_demand_period_url(data)
+
+        # Period request depends on limits data, not on limits being saved
+        _, buff = await asyncio.gather(
+            _write_fixture("historical-power-demand-limits", buff),
+            api.request_bytes("GET", url),
+        )
+        await _write_fixture("historical-power-demand", buff)
+
+    fixtures = {
+        _dump_historical_consumption: ["historical-consumption"],
+        _dump_historical_generation: ["historical-generation"],
+        _dump_historical_power_demand: [
+            "historical-power-demand-limits",
+            "historical-power-demand",
+        ],
+        _dump_measure: ["measure"],
+    }
+
+    dumpers = []
+    for fn, names in fixtures.items():
+        if not args.force and all(is_fresh_fixture(x) for x in names):
+            print(f"Skipping {fn.__name__}: fixtures are fresh")
+            continue
 
-        data = json.loads(buff.decode("utf-8"))
-        url = client._POWER_DEMAND_PERIOD_ENDPOINT.format(**data)
+        dumpers.append(fn)
 
-        buff = await api.request_bytes("GET", url)
-        with open("tests/fixtures/historical-power-demand.bin", mode="wb") as fh:
-            fh.write(buff)
-
-    for fn in [
-        _dump_historical_consumption,
-        _dump_historical_generation,
-        _dump_historical_power_demand,
-        _dump_measure,
-    ]:
-        print(f"Running {fn.__name__}", end="")
-        try:
-            await fn()
-
-        except client.RequestFailedError as e:
-            print(f": failed ({e})")
-            continue
+    if not dumpers:
+        await sess.close()
+        return
+
+    try:
+        await api.login()
+
+        # Dumpers are independent, overlap their network round-trips
+        results = await asyncio.gather(
+            *(fn() for fn in dumpers), return_exceptions=True
+        )
+        for fn, res in zip(dumpers, results):
+            if isinstance(res, client.RequestFailedError):
+                print(f"{fn.__name__}: failed ({res})")
+                continue
+
+            if isinstance(res, BaseException):
+                raise res
 
-        print(": OK")
+            print(f"{fn.__name__}: OK")
 
-    await sess.close()
+    finally:
+        await sess.close()
 
 
-asyncio.run(main())
+if uvloop:
+    uvloop.run(main())
+else:
+    asyncio.run(main())
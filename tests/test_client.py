@@ -18,83 +18,198 @@
 # USA.
 
 
+import functools
 import os
+import time
 import unittest
 from datetime import datetime, timedelta
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
 
-from ideenergy import Client, get_session
-from ideenergy.client import _LOGIN_ENDPOINT
+import aiohttp
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+from ideenergy import Client, InvalidData, get_session
+from ideenergy.client import (
+    _LOGIN_ENDPOINT,
+    _build_consumption_period_url,
+    _build_generation_period_url,
+    _json_loads_lazy,
+)
 
 FIXTURES_DIR = os.path.dirname(__file__) + "/fixtures"
 
+# Fixed range, matches the week captured in historical-generation fixture
+END = datetime(2022, 8, 27)
+START = END - timedelta(days=7)
+
 
-def read_fixture(fixture_name: str):
+@functools.lru_cache(maxsize=None)
+def read_fixture(fixture_name: str) -> bytes:
     with open(f"{FIXTURES_DIR}/{fixture_name}.bin", "rb") as fh:
         return fh.read()
 
 
 class TestClient(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        # request_bytes is always patched, no session (nor network) is needed
+        cls.client = Client(None, "x", "y")
+
+        patcher = patch("ideenergy.Client.request_bytes", new_callable=AsyncMock)
+        cls.request_bytes = patcher.start()
+        cls.addClassCleanup(patcher.stop)
+
+        patcher = patch.object(
+            Client, "is_logged", new_callable=PropertyMock, return_value=True
+        )
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
+
     async def asyncSetUp(self):
-        self.sess = await get_session()
-        self.client = Client(None, "x", "y")
-        self.end = datetime.now().replace(hour=0, minute=0, second=0)
-        self.start = self.end - timedelta(days=7)
+        self.request_bytes.reset_mock(return_value=True, side_effect=True)
 
-    async def asyncTearDown(self):
-        await self.sess.close()
+    def mock_request_bytes(self, *responses: bytes):
+        # Each request gets the next response, extra requests fail the test
+        self.request_bytes.side_effect = list(responses)
 
     async def test_login_ok(self):
-        with patch(
-            "ideenergy.Client.request_bytes",
-            new_class=AsyncMock,
-            return_value=read_fixture("login-ok"),
-        ) as fn:
-            await self.client.login()
+        self.mock_request_bytes(read_fixture("login-ok"))
+        await self.client.login()
 
-        fn.assert_awaited_once()
+        self.request_bytes.assert_awaited_once()
 
-        args, kwargs = fn.call_args
+        args, kwargs = self.request_bytes.call_args
         self.assertEqual(args, ("POST", _LOGIN_ENDPOINT))
+        # is_logged is patched, check the real deadline
+        self.assertGreater(self.client._login_deadline, time.monotonic())
+
+    async def test_is_icp_ready(self):
+        self.mock_request_bytes(
+            b'{"icp":"trueConectado"}',
+            b'{"icp": "trueConectado"}',
+            b'{"icp":"falseDesconectado"}',
+        )
+
+        self.assertTrue(await self.client.is_icp_ready())
+        self.assertTrue(await self.client.is_icp_ready())
+        self.assertFalse(await self.client.is_icp_ready())
+
+    async def test_historical_consumption(self):
+        self.mock_request_bytes(read_fixture("historical-consumption"))
+
+        ret = await self.client.get_historical_consumption(START, END)
+        self.assertEqual(ret.total, 48867.0)
+
+    async def test_historical_generation(self):
+        self.mock_request_bytes(read_fixture("historical-generation"))
+
+        ret = await self.client.get_historical_generation(START, END)
+
+        self.assertEqual(len(ret.periods), 168)
+        self.assertEqual(ret.periods[25].start, datetime(2022, 8, 20, 1, 0))
+        self.assertEqual(ret.periods[25].value, 0.0)
+
+    async def test_historical_reversed_range(self):
+        self.mock_request_bytes(
+            read_fixture("historical-consumption"),
+            read_fixture("historical-generation"),
+        )
+
+        await self.client.get_historical_consumption(END, START)
+        await self.client.get_historical_generation(END, START)
+
+        (c_args, _), (g_args, _) = self.request_bytes.call_args_list
+        self.assertEqual(c_args, ("GET", _build_consumption_period_url(START, END)))
+        self.assertEqual(g_args, ("GET", _build_generation_period_url(START, END)))
+
+    async def test_historical_power_demand(self):
+        self.mock_request_bytes(
+            read_fixture("historical-power-demand-limits"),
+            read_fixture("historical-power-demand"),
+        )
+
+        ret = await self.client.get_historical_power_demand()
+
+        self.assertEqual(len(ret.demands), 58)
+        self.assertEqual(ret.demands[25].dt, datetime(2022, 5, 28, 22, 15))
+        self.assertEqual(ret.demands[25].value, 2816.0)
+
+
+class TestJsonLoadsLazy(unittest.TestCase):
+    def test_non_ascii(self):
+        buff = '{"a": "Sábado"}'.encode("iso-8859-1")
+        self.assertEqual(_json_loads_lazy(buff, "iso-8859-1")["a"], "Sábado")
+
+        with patch("ideenergy.client.simdjson", None):
+            data = _json_loads_lazy(buff, "iso-8859-1")
+            self.assertEqual(data, {"a": "Sábado"})
+
+    def test_malformed(self):
+        with self.assertRaises(InvalidData):
+            _json_loads_lazy(b'{"a": ')
+
+        with patch("ideenergy.client.simdjson", None):
+            with self.assertRaises(InvalidData):
+                _json_loads_lazy(b'{"a": ')
+
+    @unittest.skipIf(simdjson is None, "simdjson not installed")
+    def test_previous_document_alive(self):
+        first = _json_loads_lazy(b'{"a": 1}')
+        second = _json_loads_lazy(b'{"b": 2}')
+
+        self.assertEqual(first["a"], 1)
+        self.assertEqual(second["b"], 2)
+
+
+class TestClientSession(unittest.IsolatedAsyncioTestCase):
+    def mock_session(self):
+        sess = MagicMock()
+        sess.close = AsyncMock()
+        return sess
+
+    async def test_create_owns_session(self):
+        sess = self.mock_session()
+        with patch("ideenergy.client.get_session", new_callable=AsyncMock) as fn:
+            fn.return_value = sess
+            async with await Client.create("x", "y") as client:
+                self.assertIsInstance(client, Client)
+                sess.close.assert_not_awaited()
+
+        sess.close.assert_awaited_once()
+
+    async def test_create_closes_session_on_error(self):
+        sess = self.mock_session()
+        with patch("ideenergy.client.get_session", new_callable=AsyncMock) as fn:
+            fn.return_value = sess
+            with self.assertRaises(TypeError):
+                await Client.create("x", "y", bogus=1)
+
+        sess.close.assert_awaited_once()
+
+    async def test_session_default_headers(self):
+        sess = await get_session()
+        try:
+            self.assertTrue(Client(sess, "x", "y")._session_has_headers)
+        finally:
+            await sess.close()
 
-    @patch("ideenergy.Client.is_logged", return_value=True)
-    async def test_historical_consumption(self, _):
-        with patch(
-            "ideenergy.Client.request_bytes",
-            new_class=AsyncMock,
-            return_value=read_fixture("historical-consumption"),
-        ):
-            ret = await self.client.get_historical_consumption(self.start, self.end)
-            self.assertEqual(ret.total, 48867.0)
-
-    @patch("ideenergy.Client.is_logged", return_value=True)
-    async def test_historical_generation(self, _):
-        with patch(
-            "ideenergy.Client.request_bytes",
-            new_class=AsyncMock,
-            side_effect=[read_fixture("historical-generation")],
-        ):
-            ret = await self.client.get_historical_generation(self.start, self.end)
-
-            self.assertEqual(len(ret.periods), 168)
-            self.assertEqual(ret.periods[25].start, datetime(2022, 8, 20, 1, 0))
-            self.assertEqual(ret.periods[25].value, 0.0)
-
-    @patch("ideenergy.Client.is_logged", return_value=True)
-    async def test_historical_power_demand(self, _):
-        with patch(
-            "ideenergy.Client.request_bytes",
-            new_class=AsyncMock,
-            side_effect=[
-                read_fixture("historical-power-demand-limits"),
-                read_fixture("historical-power-demand"),
-            ],
-        ):
-            ret = await self.client.get_historical_power_demand()
-
-            self.assertEqual(len(ret.demands), 58)
-            self.assertEqual(ret.demands[25].dt, datetime(2022, 5, 28, 22, 15))
-            self.assertEqual(ret.demands[25].value, 2816.0)
+        sess = aiohttp.ClientSession()
+        try:
+            self.assertFalse(Client(sess, "x", "y")._session_has_headers)
+        finally:
+            await sess.close()
+
+    async def test_close_keeps_external_session(self):
+        sess = self.mock_session()
+        async with Client(sess, "x", "y") as client:
+            pass
+
+        await client.close()
+        sess.close.assert_not_awaited()
 
 
 if __name__ == "__main__":
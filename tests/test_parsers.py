@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2021-2022 Luis López <luis@cuarentaydos.com>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301,
+# USA.
+
+import unittest
+from datetime import datetime
+
+from ideenergy.parsers import _parse_dmy_hm
+
+
+class TestParsers(unittest.TestCase):
+    def test_parse_dmy_hm(self):
+        # Fixed width fast path
+        self.assertEqual(
+            _parse_dmy_hm("28/05/2022 22:15"), datetime(2022, 5, 28, 22, 15)
+        )
+        # Non padded values go through strptime
+        self.assertEqual(_parse_dmy_hm("1/5/2022 22:15"), datetime(2022, 5, 1, 22, 15))
+
+    def test_parse_dmy_hm_rejects_malformed(self):
+        for s in ["28-05-2022 22:15", "28/05/2022 22:1 ", "31/02/2022 10:00", ""]:
+            with self.subTest(s=s), self.assertRaises(ValueError):
+                _parse_dmy_hm(s)
+
+
+if __name__ == "__main__":
+    unittest.main()